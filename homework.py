@@ -1,33 +1,83 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import re
+import signal
 import sys
 import time
+from email.utils import formatdate
 from http import HTTPStatus
-from json import JSONDecodeError
+from pathlib import Path
 
+import orjson
 import requests
-import telegram
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 from exception import EmergencyStop, ErrorGetApi, StatusNotOK
 
-load_dotenv()
+
+def _load_env():
+    """Загрузка переменных окружения из файла .env, если он есть."""
+    env_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '.env')
+    if os.path.exists(env_file):
+        from dotenv import load_dotenv
+        load_dotenv(env_file)
+
+
+_load_env()
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler(sys.stdout)
-logger.addHandler(handler)
-formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
+
+
+def setup_logging():
+    """Настройка логирования с выводом через фоновый QueueListener."""
+    if logger.handlers:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    log_level = os.getenv('LOG_LEVEL', 'DEBUG').upper()
+    if not isinstance(logging.getLevelName(log_level), int):
+        logger.warning('Неизвестный уровень логирования %s, '
+                       'используется DEBUG', log_level)
+        log_level = 'DEBUG'
+    logger.setLevel(log_level)
+
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
+MAX_RETRY_PERIOD = 3600
+RETRY_JITTER = 0.1
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
-HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_TIMEOUT = (5, 30)
+# updater.stop() ждёт завершения getUpdates, а Heroku убивает процесс
+# через 30 секунд после SIGTERM: long polling должен укладываться в этот срок.
+LONG_POLLING_TIMEOUT = 10
+TELEGRAM_POOL_SIZE = 8
+TELEGRAM_TIMEOUTS = {'connect_timeout': 5.0, 'read_timeout': 10.0}
+SEND_ATTEMPTS = 3
+SEND_RETRY_DELAY = 1
+OBJECT_REPR = re.compile(r'<[^<>]* object at 0x[0-9a-fA-F]+>')
+TIMESTAMP_FILE = Path(os.getenv(
+    'TIMESTAMP_FILE', Path(__file__).resolve().parent / '.last_ts'))
+
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
 
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -39,31 +89,74 @@ HOMEWORK_VERDICTS = {
 def check_tokens():
     """Проверка доступности обязательных переменных окружения."""
     if not all((TELEGRAM_TOKEN, PRACTICUM_TOKEN, TELEGRAM_CHAT_ID)):
-        logger.critical('Отсутствуют обязательные переменные')
-        raise EmergencyStop
+        message = 'Отсутствуют обязательные переменные'
+        logger.critical(message)
+        raise EmergencyStop(message)
+
+    chat_id = str(TELEGRAM_CHAT_ID)
+    if not (chat_id.startswith('@') or chat_id.lstrip('-').isdigit()):
+        message = f'Некорректный TELEGRAM_CHAT_ID: {chat_id}'
+        logger.critical(message)
+        raise EmergencyStop(message)
 
 
 def send_message(bot, message):
-    """Отправка сообщения в чат телеграмма."""
-    try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID,
-                         text=message)
-        logger.debug('Отправка сообщения в телеграмм')
-    except telegram.TelegramError as error:
-        logger.error(f'Ошибка при отправке сообщения: {error}!')
+    """Отправка сообщения в чат телеграмма.
+
+    Возвращает True, если сообщение доставлено.
+    """
+    import telegram
+
+    for attempt in range(1, SEND_ATTEMPTS + 1):
+        try:
+            bot.send_message(chat_id=TELEGRAM_CHAT_ID,
+                             text=message)
+            logger.debug('Отправка сообщения в телеграмм')
+            return True
+        except telegram.error.TimedOut as error:
+            # Сообщение могло дойти несмотря на таймаут: повтор рискует
+            # дублем, но это лучше, чем потерянное уведомление.
+            logger.warning('Таймаут при отправке сообщения '
+                           '(попытка %s из %s): %s',
+                           attempt, SEND_ATTEMPTS, error)
+            if attempt < SEND_ATTEMPTS:
+                time.sleep(SEND_RETRY_DELAY * 2 ** (attempt - 1))
+        except telegram.TelegramError as error:
+            logger.error('Ошибка при отправке сообщения: %s!', error)
+            return False
+    logger.error('Сообщение не отправлено: превышено число попыток')
+    return False
+
+
+def send_new_message(bot, message, last_message):
+    """Отправка сообщения, если оно отличается от уже доставленного.
+
+    Возвращает True, если сообщение доставлено сейчас или ранее.
+    """
+    if message == last_message:
+        return True
+    return send_message(bot, message)
 
 
 def get_api_answer(timestamp):
     """Запрос к сервису Яндекс-практикум."""
     payload = {'from_date': timestamp}
+    headers = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+    if timestamp:
+        headers['If-Modified-Since'] = formatdate(timestamp, usegmt=True)
 
     try:
-        logger.info(f'Попытка отправить Get запрос к endpoint {ENDPOINT}')
-        response = requests.get(ENDPOINT, headers=HEADERS, params=payload)
+        logger.info('Попытка отправить Get запрос к endpoint %s', ENDPOINT)
+        response = SESSION.get(ENDPOINT, headers=headers, params=payload,
+                               timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
     except requests.RequestException as error:
         raise ErrorGetApi(f'Ошибка при запросе к endpoint:{ENDPOINT} {error}')
 
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        logger.info('Данные на endpoint %s не изменились', ENDPOINT)
+        return {'homeworks': [], 'current_date': timestamp}
+
     if response.status_code != HTTPStatus.OK:
         raise StatusNotOK(f'Параметры запроса:'
                           f'endpoint: {ENDPOINT}'
@@ -72,11 +165,11 @@ def get_api_answer(timestamp):
                           f'контент ответа:{response.content}')
 
     try:
-        response = response.json()
-    except JSONDecodeError:
+        response = orjson.loads(response.content)
+    except orjson.JSONDecodeError:
         raise ValueError('Ошибка конвертации данных из json')
 
-    logger.info(f'Получен успешный ответ от endpoint {ENDPOINT}')
+    logger.info('Получен успешный ответ от endpoint %s', ENDPOINT)
     return response
 
 
@@ -84,14 +177,15 @@ def check_response(response):
     """Проверка корректности данных ответа.
     с Яндекс-практикума.
     """
-    if not isinstance(response, dict):
+    if type(response) is not dict:
         raise TypeError('Ответ сервера не является типом "dict"')
 
-    if 'homeworks' not in response:
+    try:
+        homework = response['homeworks']
+    except KeyError:
         raise KeyError('Ключ "homeworks" отсутствует в ответе')
-    homework = response.get('homeworks')
 
-    if not isinstance(homework, list):
+    if type(homework) is not list:
         raise TypeError('Данные по ключу "homeworks" не являются'
                         ' типом "list"')
     logger.info('Получены корректные данные ответа с сервера Яндекс-практикум')
@@ -99,61 +193,164 @@ def check_response(response):
     return homework
 
 
-def parse_status(homework):
-    """Получение статуса домашней работы."""
-    if 'homework_name' not in homework:
+def get_verdict(homework):
+    """Получение названия домашней работы и вердикта ревьюера."""
+    homework_name = homework.get('homework_name')
+    if homework_name is None:
         raise KeyError('Отсутсвует ключ "homework_name"')
-    homework_name = homework['homework_name']
 
-    if 'status' not in homework:
+    status = homework.get('status')
+    if status is None:
         raise KeyError('Отсутсвует ключ "status"')
-    status = homework['status']
 
-    try:
-        verdict = HOMEWORK_VERDICTS[status]
-    except KeyError as error:
-        raise KeyError(f'Неизвестный статус домашней работы {error}')
+    verdict = HOMEWORK_VERDICTS.get(status)
+    if verdict is None:
+        raise KeyError(f'Неизвестный статус домашней работы {status}')
 
     logger.info('В ответе присутствуют ключи "homework_name", "status"')
     logger.info('Получен статус домашней работы')
 
+    return homework_name, verdict
+
+
+def parse_status(homework):
+    """Получение статуса домашней работы."""
+    homework_name, verdict = get_verdict(homework)
     return f'Изменился статус проверки работы "{homework_name}". {verdict}'
 
 
+def load_timestamp():
+    """Чтение метки времени последнего успешного запроса с диска."""
+    try:
+        return int(TIMESTAMP_FILE.read_text())
+    except FileNotFoundError:
+        return int(time.time())
+    except (OSError, ValueError) as error:
+        logger.error('Ошибка чтения файла %s: %s', TIMESTAMP_FILE, error)
+        return int(time.time())
+
+
+def save_timestamp(timestamp):
+    """Атомарная запись метки времени последнего успешного запроса."""
+    tmp_file = TIMESTAMP_FILE.with_name(f'{TIMESTAMP_FILE.name}.tmp')
+    try:
+        tmp_file.write_text(str(timestamp))
+        os.replace(tmp_file, TIMESTAMP_FILE)
+    except OSError as error:
+        logger.error('Ошибка записи файла %s: %s', TIMESTAMP_FILE, error)
+
+
+def error_key(error):
+    """Ключ для сравнения ошибок без адресов объектов в тексте."""
+    return type(error), OBJECT_REPR.sub('<object>', str(error))
+
+
+def on_status(update, context):
+    """Ответ на команду /status актуальным статусом домашней работы."""
+    try:
+        homeworks = check_response(get_api_answer(0))
+        if homeworks:
+            homework_name, verdict = get_verdict(homeworks[0])
+            message = f'Статус проверки работы "{homework_name}". {verdict}'
+        else:
+            message = 'Домашние работы не найдены'
+    except Exception as error:
+        message = f'Сбой в работе программы: {error}'
+        logger.error(message)
+    update.effective_message.reply_text(message)
+
+
+def start_updater(bot):
+    """Запуск long polling telegram для обработки команд пользователя."""
+    import telegram.ext
+
+    if TELEGRAM_CHAT_ID.startswith('@'):
+        chat_filter = telegram.ext.Filters.chat(username=TELEGRAM_CHAT_ID)
+    else:
+        chat_filter = telegram.ext.Filters.chat(chat_id=int(TELEGRAM_CHAT_ID))
+
+    updater = telegram.ext.Updater(bot=bot, use_context=True)
+    updater.dispatcher.add_handler(telegram.ext.CommandHandler(
+        'status', on_status, filters=chat_filter
+    ))
+    updater.start_polling(timeout=LONG_POLLING_TIMEOUT,
+                          drop_pending_updates=True)
+    logger.info('Запущена обработка команды /status')
+    return updater
+
+
+def handle_sigterm(signum, frame):
+    """Прерывание основного цикла по сигналу SIGTERM."""
+    logger.info('Получен сигнал %s, бот останавливается', signum)
+    raise SystemExit(0)
+
+
 def main():
     """Основная логика работы бота."""
+    import telegram
+    import telegram.utils.request
+
+    setup_logging()
     check_tokens()
     logger.info('Присутствуют все обязательные переменные окружения')
 
     try:
         logger.info('Попытка запустить telegram-bot')
-        bot = telegram.Bot(token=TELEGRAM_TOKEN)
+        request = telegram.utils.request.Request(
+            con_pool_size=TELEGRAM_POOL_SIZE, **TELEGRAM_TIMEOUTS)
+        bot = telegram.Bot(token=TELEGRAM_TOKEN, request=request)
     except telegram.TelegramError as error:
-        logger.critical(f'Ошибка при запуске бота {str(error)}')
-        raise EmergencyStop
+        logger.critical('Ошибка при запуске бота %s', error)
+        raise EmergencyStop(f'Ошибка при запуске бота {error}') from error
 
     logger.info('Telegram-bot успешно запущен')
 
-    timestamp = int(time.time())
+    timestamp = load_timestamp()
+    delay = RETRY_PERIOD
+    last_message = None
+    last_error = None
 
-    while True:
-        try:
-            response = get_api_answer(timestamp)
-            timestamp = response.get('current_date')
-            homeworks = check_response(response)
-
-            if homeworks:
-                message = parse_status(homeworks[0])
-                send_message(bot, message)
-            logger.debug('Статус домашней работы не изменился')
-
-        except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logger.error(f'Сбой в работе программы: {error}')
-            send_message(bot, message)
-
-        finally:
-            time.sleep(RETRY_PERIOD)
+    previous_handler = signal.getsignal(signal.SIGTERM)
+    updater = None
+    try:
+        signal.signal(signal.SIGTERM, handle_sigterm)
+        updater = start_updater(bot)
+        while True:
+            try:
+                response = get_api_answer(timestamp)
+                homeworks = check_response(response)
+                delivered = True
+
+                if homeworks:
+                    message = parse_status(homeworks[0])
+                    delivered = send_new_message(bot, message, last_message)
+                    if delivered:
+                        last_message = message
+                else:
+                    logger.debug('Статус домашней работы не изменился')
+
+                if delivered:
+                    timestamp = response.get('current_date', timestamp)
+                    save_timestamp(timestamp)
+                last_error = None
+                delay = RETRY_PERIOD
+
+            except Exception as error:
+                message = f'Сбой в работе программы: {error}'
+                logger.error('Сбой в работе программы: %s', error)
+                error_id = error_key(error)
+                if error_id == last_error or send_message(bot, message):
+                    last_error = error_id
+                delay = min(delay * 2, MAX_RETRY_PERIOD)
+
+            pause = delay * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
+            time.sleep(pause)
+    finally:
+        if updater is not None:
+            updater.stop()
+        SESSION.close()
+        signal.signal(signal.SIGTERM, previous_handler)
+        logger.info('Telegram-bot остановлен')
 
 
 if __name__ == '__main__':
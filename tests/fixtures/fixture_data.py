@@ -23,6 +23,14 @@ def homework_module():
     return homework
 
 
+@pytest.fixture(autouse=True)
+def timestamp_file(tmp_path, monkeypatch):
+    import homework
+    path = tmp_path / '.last_ts'
+    monkeypatch.setattr(homework, 'TIMESTAMP_FILE', path)
+    return path
+
+
 @pytest.fixture
 def random_message():
     def random_string(string_length=15):
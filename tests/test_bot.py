@@ -1,13 +1,20 @@
+import atexit
 import inspect
 import logging
+import os
 import platform
+import random
 import re
+import signal
+import subprocess
+import sys
 import time
 from http import HTTPStatus
 
 import pytest
 import requests
 import telegram
+import telegram.ext
 
 import utils
 
@@ -43,7 +50,7 @@ class TestHomework:
     ENV_VARS = ['PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID']
     HOMEWORK_CONSTANTS = ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN',
                           'TELEGRAM_CHAT_ID', 'RETRY_PERIOD',
-                          'ENDPOINT', 'HEADERS', 'HOMEWORK_VERDICTS')
+                          'ENDPOINT', 'HOMEWORK_VERDICTS')
     HOMEWORK_FUNC_WITH_PARAMS_QTY = {
         'send_message': 2,
         'get_api_answer': 1,
@@ -72,6 +79,13 @@ class TestHomework:
             }],
             None
         ),
+        'homeworks_is_none': utils.InvalidResponse(
+            {
+                'homeworks': None,
+                'current_date': 123246
+            },
+            None
+        ),
         'homeworks_not_in_list': utils.InvalidResponse(
             {
                 'homeworks':
@@ -172,14 +186,15 @@ class TestHomework:
             assert url.startswith(expected_url), (
                 'Проверьте адрес, на который отправляются запросы.'
             )
-            assert 'headers' in kwargs, (
-                'Проверьте, что в запрос к API передан заголовок.'
-            )
-            assert 'Authorization' in kwargs['headers'], (
+            headers = {
+                **homework_module.SESSION.headers,
+                **kwargs.get('headers', {})
+            }
+            assert 'Authorization' in headers, (
                 'Проверьте, что в заголовках запроса передано поле '
                 '`Authorization`.'
             )
-            assert kwargs['headers']['Authorization'].startswith('OAuth '), (
+            assert headers['Authorization'].startswith('OAuth '), (
                 'Проверьте, что заголовок `Authorization` '
                 'начинается с `OAuth`.'
             )
@@ -200,7 +215,7 @@ class TestHomework:
                     'Проверьте, что в параметре `from_date` передано число.'
                 )
 
-        monkeypatch.setattr(requests, 'get', check_request_call)
+        monkeypatch.setattr(homework_module.SESSION, 'get', check_request_call)
         try:
             homework_module.get_api_answer(current_timestamp)
         except AssertionError:
@@ -223,7 +238,7 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(homework_module.SESSION, 'get', mock_response_get)
 
         result = homework_module.get_api_answer(current_timestamp)
         assert isinstance(result, dict), (
@@ -243,7 +258,7 @@ class TestHomework:
             self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
         )
 
-        monkeypatch.setattr(requests, 'get', response)
+        monkeypatch.setattr(homework_module.SESSION, 'get', response)
         try:
             homework_module.get_api_answer(current_timestamp)
         except Exception:
@@ -267,7 +282,8 @@ class TestHomework:
         def mock_request_get_with_exception(*args, **kwargs):
             raise requests.RequestException('Something wrong')
 
-        monkeypatch.setattr(requests, 'get', mock_request_get_with_exception)
+        monkeypatch.setattr(homework_module.SESSION, 'get',
+                            mock_request_get_with_exception)
         try:
             homework_module.get_api_answer(current_timestamp)
         except requests.RequestException as e:
@@ -279,6 +295,58 @@ class TestHomework:
         except Exception:
             pass
 
+    def test_get_api_answer_not_modified(self, monkeypatch,
+                                         random_timestamp,
+                                         current_timestamp,
+                                         homework_module):
+        monkeypatch.setattr(
+            homework_module.SESSION, 'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp=random_timestamp,
+                http_status=HTTPStatus.NOT_MODIFIED,
+                data={}
+            )
+        )
+
+        def mock_loads(*args, **kwargs):
+            raise AssertionError(
+                'Убедитесь, что при ответе 304 тело ответа не декодируется.'
+            )
+
+        monkeypatch.setattr(homework_module.orjson, 'loads', mock_loads)
+
+        result = homework_module.get_api_answer(current_timestamp)
+        assert result == {
+            'homeworks': [],
+            'current_date': current_timestamp
+        }, (
+            'Убедитесь, что при ответе 304 функция `get_api_answer` '
+            'возвращает пустой список `homeworks` и прежний `current_date`.'
+        )
+
+    @pytest.mark.parametrize('with_timestamp', [True, False])
+    def test_get_api_answer_if_modified_since(self, monkeypatch,
+                                              with_timestamp,
+                                              random_timestamp,
+                                              current_timestamp,
+                                              homework_module):
+        timestamp = current_timestamp if with_timestamp else 0
+        sent_headers = {}
+
+        def mock_response_get(*args, **kwargs):
+            sent_headers.update(kwargs.get('headers', {}))
+            return utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp, **kwargs
+            )
+
+        monkeypatch.setattr(homework_module.SESSION, 'get',
+                            mock_response_get)
+        homework_module.get_api_answer(timestamp)
+        assert ('If-Modified-Since' in sent_headers) is with_timestamp, (
+            'Убедитесь, что заголовок `If-Modified-Since` передаётся '
+            'только при ненулевом `timestamp`.'
+        )
+
     def test_parse_status_with_expected_statuses(self, homework_module):
         func_name = 'parse_status'
         utils.check_function(
@@ -458,6 +526,45 @@ class TestHomework:
             else:
                 raise AssertionError(assert_message)
 
+    def test_load_timestamp_without_file(self, homework_module,
+                                         timestamp_file):
+        before = int(time.time())
+        result = homework_module.load_timestamp()
+        assert before <= result <= int(time.time()), (
+            'Убедитесь, что при отсутствии файла с меткой времени функция '
+            '`load_timestamp` возвращает текущее время.'
+        )
+
+    def test_load_timestamp_with_bad_contents(self, homework_module,
+                                              timestamp_file, caplog):
+        timestamp_file.write_text('not a timestamp')
+        before = int(time.time())
+        with utils.check_logging(caplog, level=logging.ERROR, message=(
+                'Убедитесь, что ошибка чтения файла с меткой времени '
+                'логируется с уровнем `ERROR`.'
+        )):
+            result = homework_module.load_timestamp()
+        assert before <= result <= int(time.time()), (
+            'Убедитесь, что при повреждённом файле с меткой времени функция '
+            '`load_timestamp` возвращает текущее время.'
+        )
+
+    def test_save_timestamp(self, homework_module, timestamp_file,
+                            random_timestamp):
+        homework_module.save_timestamp(random_timestamp)
+        assert timestamp_file.read_text() == str(random_timestamp), (
+            'Убедитесь, что функция `save_timestamp` записывает метку '
+            'времени в файл `TIMESTAMP_FILE`.'
+        )
+        assert list(timestamp_file.parent.iterdir()) == [timestamp_file], (
+            'Убедитесь, что функция `save_timestamp` не оставляет '
+            'временных файлов.'
+        )
+        assert homework_module.load_timestamp() == random_timestamp, (
+            'Убедитесь, что функция `load_timestamp` читает метку времени, '
+            'записанную `save_timestamp`.'
+        )
+
     def test_send_message(self, monkeypatch, random_message,
                           caplog, homework_module):
         monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
@@ -503,7 +610,7 @@ class TestHomework:
             inspect.getsource(homework_module.main)
         )
         bot_init_pattern = re.compile(
-            r'(\w* ?= ?)((telegram\.)?Bot\( *[\w=_\-\'\"]* *\))'
+            r'(\w* ?= ?)((telegram\.)?Bot\( *[\w=_\-\'\", ]* *\))'
         )
         search_result = re.search(bot_init_pattern, main_source)
         assert search_result, (
@@ -511,7 +618,7 @@ class TestHomework:
         )
 
         bot_init_with_token_pattern = re.compile(
-            r'Bot\( *token *= *TELEGRAM_TOKEN *\)'
+            r'Bot\( *token *= *TELEGRAM_TOKEN *[,)]'
         )
         assert re.search(bot_init_with_token_pattern, main_source), (
             'Убедитесь, что при создании бота в него передан токен: '
@@ -553,9 +660,9 @@ class TestHomework:
             if caller != 'main':
                 old_sleep(secs)
                 return
-            assert secs == 600, (
+            assert 540 <= secs <= 660, (
                 'Убедитесь, что повторный запрос к API домашки отправляется '
-                'через 10 минут: `time.sleep(RETRY_PERIOD)`.'
+                'примерно через 10 минут: `RETRY_PERIOD` с разбросом 10%.'
             )
             raise utils.BreakInfiniteLoop('break')
 
@@ -568,6 +675,7 @@ class TestHomework:
                                              **kwargs)
 
             monkeypatch.setattr(telegram, 'Bot', mock_telegram_bot)
+        monkeypatch.setattr(telegram.ext, 'Updater', utils.MockUpdater)
 
         func_name = 'get_api_answer'
         utils.check_function(
@@ -583,7 +691,7 @@ class TestHomework:
                 data=response_data
             ))
         monkeypatch.setattr(
-            requests,
+            homework_module.SESSION,
             'get',
             mock_response_get_with_new_status
         )
@@ -638,7 +746,7 @@ class TestHomework:
                     if record.message == utils.MockResponseGET.CALLED_LOG_MSG
                 ]
                 assert log_record, (
-                    'Убедитесь, что бот использует функцию `requests.get()` '
+                    'Убедитесь, что бот использует метод `SESSION.get()` '
                     'для отправки запроса к API домашки.'
                 )
 
@@ -772,6 +880,421 @@ class TestHomework:
                     'возникновении ошибки отправки сообщения в Телеграм.'
                 ) from e
 
+    def test_main_keeps_timestamp_when_send_failed(self, monkeypatch,
+                                                   random_timestamp,
+                                                   current_timestamp,
+                                                   random_message,
+                                                   homework_module,
+                                                   timestamp_file,
+                                                   data_with_new_hw_status):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module,
+            mock_bot=False,
+            response_data=data_with_new_hw_status
+        )
+
+        class MockedBotWithException(utils.MockTelegramBot):
+            def send_message(self, *args, **kwargs):
+                raise telegram.error.TelegramError('Something wrong')
+
+        monkeypatch.setattr(telegram, 'Bot', MockedBotWithException)
+
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+        assert not timestamp_file.exists(), (
+            'Убедитесь, что метка времени не сохраняется, если сообщение '
+            'о новом статусе не удалось отправить в Telegram.'
+        )
+
+    def test_send_message_returns_delivery_status(self, monkeypatch,
+                                                  random_message,
+                                                  homework_module):
+        bot = get_mock_telegram_bot(monkeypatch, random_message)
+        assert homework_module.send_message(bot, 'Test') is True, (
+            'Убедитесь, что функция `send_message` возвращает `True` '
+            'при успешной отправке сообщения.'
+        )
+
+        class MockedBotWithException(utils.MockTelegramBot):
+            def send_message(self, *args, **kwargs):
+                raise telegram.error.TelegramError('Something wrong')
+
+        assert homework_module.send_message(
+            MockedBotWithException(), 'Test'
+        ) is False, (
+            'Убедитесь, что функция `send_message` возвращает `False` '
+            'при ошибке отправки сообщения.'
+        )
+
+    def test_send_message_retries_on_timeout(self, monkeypatch,
+                                             homework_module):
+        pauses = []
+        monkeypatch.setattr(time, 'sleep', pauses.append)
+
+        class MockedBotWithTimeout(utils.MockTelegramBot):
+            calls = 0
+
+            def send_message(self, *args, **kwargs):
+                MockedBotWithTimeout.calls += 1
+                if MockedBotWithTimeout.calls == 1:
+                    raise telegram.error.TimedOut()
+                super().send_message(*args, **kwargs)
+
+        bot = MockedBotWithTimeout()
+        assert homework_module.send_message(bot, 'Test') is True, (
+            'Убедитесь, что функция `send_message` повторяет отправку '
+            'сообщения после таймаута.'
+        )
+        assert MockedBotWithTimeout.calls == 2
+        assert len(pauses) == 1 and pauses[0] > 0, (
+            'Убедитесь, что перед повторной отправкой сообщения '
+            'выдерживается пауза.'
+        )
+
+    def test_send_message_gives_up_after_timeouts(self, monkeypatch,
+                                                  caplog, homework_module):
+        pauses = []
+        monkeypatch.setattr(time, 'sleep', pauses.append)
+
+        class MockedBotWithTimeout(utils.MockTelegramBot):
+            calls = 0
+
+            def send_message(self, *args, **kwargs):
+                MockedBotWithTimeout.calls += 1
+                raise telegram.error.TimedOut()
+
+        with utils.check_logging(caplog, level=logging.ERROR, message=(
+                'Убедитесь, что неудачная отправка сообщения после всех '
+                'попыток логируется с уровнем `ERROR`.'
+        )):
+            result = homework_module.send_message(
+                MockedBotWithTimeout(), 'Test'
+            )
+        assert result is False, (
+            'Убедитесь, что функция `send_message` возвращает `False`, '
+            'если все попытки отправки завершились таймаутом.'
+        )
+        attempts = homework_module.SEND_ATTEMPTS
+        assert MockedBotWithTimeout.calls == attempts, (
+            'Убедитесь, что число попыток отправки ограничено '
+            '`SEND_ATTEMPTS`.'
+        )
+        assert len(pauses) == attempts - 1, (
+            'Убедитесь, что пауза выдерживается только между попытками.'
+        )
+        assert pauses == sorted(pauses) and pauses[0] < pauses[-1], (
+            'Убедитесь, что пауза между попытками отправки растёт.'
+        )
+
+    def test_main_backoff_on_failures(self, monkeypatch, random_message,
+                                      homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        get_mock_telegram_bot(monkeypatch, random_message)
+        monkeypatch.setattr(telegram.ext, 'Updater', utils.MockUpdater)
+        monkeypatch.setattr(random, 'uniform', lambda a, b: 1)
+
+        outcomes = [False, False, False, False, True, False]
+
+        def mock_get_api_answer(timestamp):
+            if outcomes.pop(0):
+                return {'homeworks': [], 'current_date': timestamp}
+            raise homework_module.ErrorGetApi('Something wrong')
+
+        pauses = []
+
+        def mock_sleep(secs):
+            pauses.append(secs)
+            if not outcomes:
+                raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(homework_module, 'get_api_answer',
+                            mock_get_api_answer)
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+
+        period = homework_module.RETRY_PERIOD
+        max_period = homework_module.MAX_RETRY_PERIOD
+        expected = [
+            min(period * 2, max_period),
+            min(period * 4, max_period),
+            min(period * 8, max_period),
+            min(period * 16, max_period),
+            period,
+            min(period * 2, max_period),
+        ]
+        assert pauses == expected, (
+            'Убедитесь, что после каждого сбоя пауза удваивается, но не '
+            'превышает `MAX_RETRY_PERIOD`, а после успешного запроса '
+            'возвращается к `RETRY_PERIOD`.'
+        )
+
+    def test_on_status_replies_with_current_status(self, monkeypatch,
+                                                   homework_module,
+                                                   data_with_new_hw_status):
+        monkeypatch.setattr(homework_module, 'get_api_answer',
+                            lambda timestamp: data_with_new_hw_status)
+        homework = data_with_new_hw_status['homeworks'][0]
+        update = utils.MockUpdate()
+
+        homework_module.on_status(update, None)
+
+        assert len(update.replies) == 1, (
+            'Убедитесь, что на команду /status бот отвечает одним '
+            'сообщением.'
+        )
+        reply = update.replies[0]
+        assert homework['homework_name'] in reply, (
+            'Убедитесь, что ответ на команду /status содержит название '
+            'домашней работы.'
+        )
+        assert reply.endswith(self.HOMEWORK_VERDICTS[homework['status']]), (
+            'Убедитесь, что ответ на команду /status содержит вердикт '
+            'из `HOMEWORK_VERDICTS`.'
+        )
+        assert not reply.startswith('Изменился статус'), (
+            'Убедитесь, что ответ на команду /status не сообщает '
+            'об изменении статуса.'
+        )
+
+    def test_on_status_replies_with_error(self, monkeypatch, caplog,
+                                          homework_module):
+        def mock_get_api_answer(timestamp):
+            raise homework_module.ErrorGetApi('Something wrong')
+
+        monkeypatch.setattr(homework_module, 'get_api_answer',
+                            mock_get_api_answer)
+        update = utils.MockUpdate()
+
+        with utils.check_logging(caplog, level=logging.ERROR, message=(
+                'Убедитесь, что сбой при обработке команды /status '
+                'логируется с уровнем `ERROR`.'
+        )):
+            homework_module.on_status(update, None)
+
+        assert len(update.replies) == 1, (
+            'Убедитесь, что при сбое бот всё равно отвечает на команду '
+            '/status.'
+        )
+        assert update.replies[0].startswith('Сбой в работе программы'), (
+            'Убедитесь, что при сбое ответ на команду /status сообщает '
+            'об ошибке.'
+        )
+
+    @pytest.mark.parametrize('chat_id', ['12345', '-100123', '@channel'])
+    def test_start_updater_registers_status(self, monkeypatch, chat_id,
+                                            homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', chat_id)
+        monkeypatch.setattr(telegram.ext, 'Updater', utils.MockUpdater)
+
+        updater = homework_module.start_updater(utils.MockTelegramBot())
+
+        assert updater.is_polling, (
+            'Убедитесь, что функция `start_updater` запускает long polling.'
+        )
+        assert updater.polling_kwargs.get('drop_pending_updates'), (
+            'Убедитесь, что при запуске long polling команды, накопившиеся '
+            'за время простоя бота, отбрасываются.'
+        )
+        commands = [
+            command for handler in updater.handlers
+            for command in getattr(handler, 'command', [])
+        ]
+        assert commands == ['status'], (
+            'Убедитесь, что для команды /status зарегистрирован обработчик.'
+        )
+
+    def test_check_tokens_with_invalid_chat_id(self, monkeypatch,
+                                               homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', 'channel')
+        with pytest.raises(homework_module.EmergencyStop):
+            homework_module.check_tokens()
+
+    def test_main_restores_sigterm_handler(self, monkeypatch,
+                                           random_timestamp,
+                                           current_timestamp,
+                                           random_message,
+                                           homework_module):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+        assert signal.getsignal(signal.SIGTERM) == previous_handler, (
+            'Убедитесь, что после завершения `main()` восстанавливается '
+            'прежний обработчик сигнала SIGTERM.'
+        )
+
+    def test_main_restores_sigterm_handler_on_startup_error(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+
+        def mock_start_updater(bot):
+            raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(homework_module, 'start_updater',
+                            mock_start_updater)
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+        assert signal.getsignal(signal.SIGTERM) == previous_handler, (
+            'Убедитесь, что прежний обработчик сигнала SIGTERM '
+            'восстанавливается, даже если запуск long polling завершился '
+            'ошибкой.'
+        )
+
+    def test_handle_sigterm_exits_cleanly(self, caplog, homework_module):
+        with utils.check_logging(caplog, level=logging.INFO, message=(
+                'Убедитесь, что получение сигнала SIGTERM логируется.'
+        )):
+            with pytest.raises(SystemExit) as exc_info:
+                homework_module.handle_sigterm(signal.SIGTERM, None)
+        assert exc_info.value.code == 0, (
+            'Убедитесь, что остановка по сигналу SIGTERM завершает процесс '
+            'с кодом 0.'
+        )
+
+    def test_main_sends_repeated_messages_once(self, monkeypatch,
+                                              homework_module,
+                                              data_with_new_hw_status):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(telegram.ext, 'Updater', utils.MockUpdater)
+
+        sent = []
+
+        class RecordingBot(utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append(text)
+
+        monkeypatch.setattr(telegram, 'Bot', RecordingBot)
+
+        outcomes = ['homework', 'homework', 'error', 'error', 'empty',
+                    'error']
+        addresses = iter(range(0x7f0000, 0x7fffff))
+
+        def mock_get_api_answer(timestamp):
+            outcome = outcomes.pop(0)
+            if outcome == 'homework':
+                return data_with_new_hw_status
+            if outcome == 'empty':
+                return {'homeworks': [], 'current_date': timestamp}
+            raise homework_module.ErrorGetApi(
+                'Caused by NewConnectionError(\'<urllib3.connection.'
+                f'HTTPSConnection object at {hex(next(addresses))}>: '
+                'Failed to establish a new connection\')'
+            )
+
+        def mock_sleep(secs):
+            if not outcomes:
+                raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(homework_module, 'get_api_answer',
+                            mock_get_api_answer)
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+
+        verdict_messages = [
+            text for text in sent if text.startswith('Изменился статус')
+        ]
+        error_messages = [
+            text for text in sent if text.startswith('Сбой в работе')
+        ]
+        assert len(verdict_messages) == 1, (
+            'Убедитесь, что неизменившийся статус домашней работы '
+            'отправляется в Telegram только один раз.'
+        )
+        assert len(error_messages) == 2, (
+            'Убедитесь, что повторяющаяся ошибка отправляется в Telegram '
+            'один раз и снова отправляется после успешного запроса.'
+        )
+
+    def test_import_does_not_load_telegram(self, homework_module):
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import sys, homework; '
+             'sys.exit("telegram" in sys.modules)'],
+            cwd=os.path.dirname(os.path.abspath(homework_module.__file__)),
+            capture_output=True,
+        )
+        assert result.returncode == 0, (
+            'Убедитесь, что импорт модуля `homework` не импортирует '
+            '`telegram`: библиотека должна загружаться только в функциях, '
+            'которые её используют.\n' + result.stderr.decode()
+        )
+
+    def setup_fresh_logger(self, monkeypatch, homework_module, log_level,
+                           random_message):
+        logger = logging.getLogger(f'homework_test.{random_message}')
+        monkeypatch.setattr(homework_module, 'logger', logger)
+        monkeypatch.setenv('LOG_LEVEL', log_level)
+        stop_callbacks = []
+        monkeypatch.setattr(atexit, 'register', stop_callbacks.append)
+        try:
+            homework_module.setup_logging()
+        finally:
+            for callback in stop_callbacks:
+                callback()
+        return logger
+
+    def test_setup_logging_level_case_insensitive(self, monkeypatch,
+                                                  random_message,
+                                                  homework_module):
+        logger = self.setup_fresh_logger(
+            monkeypatch, homework_module, 'info', random_message
+        )
+        assert logger.level == logging.INFO, (
+            'Убедитесь, что уровень логирования из `LOG_LEVEL` '
+            'не зависит от регистра.'
+        )
+
+    def test_setup_logging_unknown_level(self, monkeypatch, caplog,
+                                         random_message, homework_module):
+        with utils.check_logging(caplog, level=logging.WARNING, message=(
+                'Убедитесь, что неизвестный уровень логирования в '
+                '`LOG_LEVEL` логируется с уровнем `WARNING`.'
+        )):
+            logger = self.setup_fresh_logger(
+                monkeypatch, homework_module, 'verbose', random_message
+            )
+        assert logger.level == logging.DEBUG, (
+            'Убедитесь, что при неизвестном значении `LOG_LEVEL` '
+            'используется уровень `DEBUG`.'
+        )
+
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             utils.check_docstring(homework_module, func)
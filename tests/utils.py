@@ -1,3 +1,4 @@
+import json
 import logging
 import signal
 import re
@@ -94,6 +95,7 @@ class MockResponseGET:
             'current_date': self.random_timestamp
         }
         self.data = default_data if data is None else data
+        self.content = json.dumps(self.data).encode()
         logging.warn(MockResponseGET.CALLED_LOG_MSG)
 
     def json(self):
@@ -114,6 +116,33 @@ class MockTelegramBot:
         self.text = text
 
 
+class MockUpdater:
+    def __init__(self, *args, **kwargs):
+        self.dispatcher = self
+        self.handlers = []
+        self.is_polling = False
+        self.polling_kwargs = {}
+
+    def add_handler(self, handler, *args, **kwargs):
+        self.handlers.append(handler)
+
+    def start_polling(self, *args, **kwargs):
+        self.is_polling = True
+        self.polling_kwargs = kwargs
+
+    def stop(self):
+        self.is_polling = False
+
+
+class MockUpdate:
+    def __init__(self):
+        self.effective_message = self
+        self.replies = []
+
+    def reply_text(self, text, *args, **kwargs):
+        self.replies.append(text)
+
+
 class BreakInfiniteLoop(Exception):
     pass
 